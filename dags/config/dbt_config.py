@@ -2,10 +2,15 @@
 """
 Configuration for dbt_mastery Airflow pipeline
 """
+import os
 
 # Paths
 DBT_PROJECT_DIR = '/Users/alexaustinchettiar/Downloads/dbt_mastery'
 DBT_PROFILES_DIR = '/Users/alexaustinchettiar/.dbt'
+# Artifacts (manifest.json, run_results.json) from the last successful dbt
+# command; passed back as --state so dbt can --defer to them. Kept outside
+# target/ so 'dbt clean' does not remove it
+DBT_STATE_DIR = os.environ.get('DBT_STATE_DIR', f'{DBT_PROJECT_DIR}/dbt_state')
 
 # Data directories
 INCOMING_DATA_DIR = '/Users/alexaustinchettiar/data_pipeline/incoming'
@@ -16,15 +21,88 @@ ARCHIVE_DATA_DIR = '/Users/alexaustinchettiar/data_pipeline/archive'
 MYSQL_CONN_ID = 'mysql_dbt_mastery'  # Airflow connection ID
 MYSQL_DATABASE = 'dbt_mastery'
 MYSQL_RAW_TABLE = 'raw_flights_data'
+# SQLAlchemy URL for the raw load; set via environment/secret so credentials
+# stay out of the repo (URL-encode special characters in the password)
+MYSQL_SQLALCHEMY_URL = os.environ.get(
+    'MYSQL_SQLALCHEMY_URL',
+    f'mysql+pymysql://root@localhost/{MYSQL_DATABASE}'
+)
 
-# dbt commands
-DBT_DEPS = f'cd {DBT_PROJECT_DIR} && dbt deps'
-DBT_RUN_STAGING = f'cd {DBT_PROJECT_DIR} && dbt run --select staging.*'
-DBT_TEST_STAGING = f'cd {DBT_PROJECT_DIR} && dbt test --select staging.*'
-DBT_RUN_INTERMEDIATE = f'cd {DBT_PROJECT_DIR} && dbt run --select intermediate.*'
-DBT_TEST_INTERMEDIATE = f'cd {DBT_PROJECT_DIR} && dbt test --select intermediate.*'
-DBT_RUN_MARTS = f'cd {DBT_PROJECT_DIR} && dbt run --select marts.*'
-DBT_TEST_MARTS = f'cd {DBT_PROJECT_DIR} && dbt test --select marts.*'
+# Idempotent raw load: files land in the staging table first, then are upserted
+# into the raw table keyed on (file_source, row_hash), so re-loading a file that
+# was never archived does not duplicate rows. row_hash is an MD5 of the record's
+# line number in the CSV and every loaded column
+MYSQL_STAGING_TABLE = 'raw_flights_staging'
+# Drop the raw table's non-unique secondary indexes for the upsert (and rebuild
+# them after) when the batch's new rows are at least this fraction of the
+# table's size; for small incremental batches, maintaining the indexes is
+# cheaper than a rebuild
+RAW_INDEX_REBUILD_MIN_FRACTION = 0.5
+
+# Loader used when the server rejects LOAD DATA LOCAL INFILE:
+#   'duckdb'      - DuckDB reads the CSV and writes through its mysql extension
+#                   (the extension is installed on first use)
+#   'executemany' - Arrow reads the CSV, PyMySQL executemany writes it
+CSV_FALLBACK_LOADER = 'duckdb'
+# Rows per executemany call; PyMySQL packs them into multi-row INSERTs that it
+# splits to stay under max_allowed_packet
+INSERT_BATCH_SIZE = 10_000
+# Bytes parsed from the CSV per Arrow batch; bounds worker memory to one block
+CSV_READ_BLOCK_SIZE = 64 << 20
+
+# Explicit Arrow column types for the raw CSV (skips type inference and keeps
+# numeric columns out of Python objects); unlisted columns are still inferred
+RAW_FLIGHTS_COLUMN_TYPES = {
+    'airline_code': 'string',
+    'airline_name': 'string',
+    'flight_number': 'string',
+    'origin_airport': 'string',
+    'origin_city': 'string',
+    'origin_country': 'string',
+    'origin_region': 'string',
+    'origin_latitude': 'float64',
+    'origin_longitude': 'float64',
+    'destination_airport': 'string',
+    'destination_city': 'string',
+    'destination_country': 'string',
+    'destination_region': 'string',
+    'destination_latitude': 'float64',
+    'destination_longitude': 'float64',
+    'distance_km': 'float64',
+    'seats': 'int32',
+    'aircraft_type': 'string',
+    'codeshare': 'string',
+    'stops': 'int32',
+    'flight_date': 'date32',
+    'flight_year': 'int32',
+    'flight_month': 'int32',
+    'flight_quarter': 'int32',
+}
+
+# DuckDB equivalents of the Arrow type aliases above (DuckDB fallback loader);
+# add an entry here when a new alias is used in RAW_FLIGHTS_COLUMN_TYPES
+DUCKDB_COLUMN_TYPES = {
+    'string': 'VARCHAR',
+    'int32': 'INTEGER',
+    'int64': 'BIGINT',
+    'float32': 'FLOAT',
+    'float64': 'DOUBLE',
+    'bool': 'BOOLEAN',
+    'date32': 'DATE',
+}
+
+_missing_duckdb_types = set(RAW_FLIGHTS_COLUMN_TYPES.values()) - set(DUCKDB_COLUMN_TYPES)
+if _missing_duckdb_types:
+    raise ValueError(f"No DUCKDB_COLUMN_TYPES entry for: {sorted(_missing_duckdb_types)}")
+
+# dbt selectors (each layer runs in-process through dbtRunner)
+DBT_SELECT_STAGING = 'staging.*'
+DBT_SELECT_INTERMEDIATE = 'intermediate.*'
+DBT_SELECT_MARTS = 'marts.*'
+
+# Airflow pool shared by all dbt tasks; caps concurrent dbt commands against
+# the warehouse. Create once with: airflow pools set dbt_cli 2 "dbt commands"
+DBT_POOL = 'dbt_cli'
 
 # File patterns
 CSV_FILE_PATTERN = 'routes_*.csv'
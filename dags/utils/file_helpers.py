@@ -2,74 +2,88 @@
 Helper functions for file management in the pipeline
 """
 import os
-import glob
+import re
+import errno
+import fnmatch
+import functools
 import shutil
-from datetime import datetime
+import time
 
 
-def find_latest_csv(directory, pattern='*.csv'):
+@functools.lru_cache(maxsize=None)
+def _compile_pattern(pattern):
     """
-    Find the most recent CSV file in a directory
+    Compile a glob pattern to a filename matcher once per process
+    """
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+def find_pending_csvs(directory, pattern='*.csv'):
+    """
+    Find all non-empty CSV files waiting in a directory
+
+    Uses a single os.scandir pass so each entry is stat'ed once
 
     Args:
         directory: Path to search
         pattern: File pattern to match
 
     Returns:
-        Path to the latest CSV file or None
+        List of CSV file paths, oldest first (empty if none)
     """
-    files = glob.glob(os.path.join(directory, pattern))
-    if not files:
-        return None
+    pending = []
+    matches = _compile_pattern(pattern)
+
+    with os.scandir(directory) as it:
+        for entry in it:
+            if not entry.is_file() or not matches(entry.name):
+                continue
 
-    # Sort by modification time, return latest
-    latest_file = max(files, key=os.path.getmtime)
-    return latest_file
+            # Skip empty files; they are not ready to load
+            stat = entry.stat()
+            if stat.st_size > 0:
+                pending.append((stat.st_mtime, entry.path))
 
+    # Load in arrival order
+    return [path for _, path in sorted(pending)]
 
-def move_file(source, destination_dir):
+
+def move_files(sources, destination_dir):
     """
-    Move file to destination directory with timestamp
+    Move files to destination directory with a shared timestamp
+
+    The directory is created and the timestamp computed once per batch.
+    Each file is renamed in place when source and destination share a
+    filesystem and only copied across devices.
 
     Args:
-        source: Source file path
+        sources: Iterable of source file paths
         destination_dir: Destination directory
 
     Returns:
-        New file path
+        List of new file paths
     """
-    if not os.path.exists(source):
-        raise FileNotFoundError(f"Source file not found: {source}")
-
     # Create destination directory if needed
     os.makedirs(destination_dir, exist_ok=True)
 
-    # Add timestamp to filename
-    filename = os.path.basename(source)
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    name, ext = os.path.splitext(filename)
-    new_filename = f"{name}_{timestamp}{ext}"
-
-    destination = os.path.join(destination_dir, new_filename)
-    shutil.move(source, destination)
-
-    return destination
-
+    timestamp = time.strftime('%Y%m%d_%H%M%S')
 
-def check_file_exists(filepath):
-    """
-    Check if file exists and is not empty
+    destinations = []
+    for source in sources:
+        # Add timestamp to filename
+        name, ext = os.path.splitext(os.path.basename(source))
+        destination = os.path.join(destination_dir, f"{name}_{timestamp}{ext}")
 
-    Args:
-        filepath: Path to file
+        try:
+            os.rename(source, destination)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Source file not found: {source}")
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(source, destination)
 
-    Returns:
-        Boolean
-    """
-    if not os.path.exists(filepath):
-        return False
+        destinations.append(destination)
 
-    if os.path.getsize(filepath) == 0:
-        return False
+    return destinations
 
-    return True